@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 from datetime import timedelta, datetime
+from functools import lru_cache
 import logging
-from typing import Any
+import math
+import re
+from typing import Any, Awaitable, Callable
 import hashlib
 import json
 import asyncio
+import random
 
 import aiohttp
+import orjson
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 DOMAIN = "deyecloud2"
@@ -32,6 +38,16 @@ SERVER_US = "us1"
 
 DEFAULT_SCAN_INTERVAL = 60
 
+# Token lifetime fallback and refresh margin (seconds)
+DEFAULT_TOKEN_TTL = 3600
+TOKEN_REFRESH_MARGIN = 300
+
+# Per-request timeout; connection pooling/keepalive is handled by HA's shared session
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=20)
+
+# Upper bound for the backoff delay between retries (seconds)
+MAX_RETRY_DELAY = 60
+
 PLATFORMS: list[str] = ["sensor", "binary_sensor"]
 
 # Modes
@@ -41,12 +57,35 @@ MODE_DEYE_DIRECT = "deye_direct"
 _LOGGER = logging.getLogger(__name__)
 
 
+class DeyeCloudHTTPError(UpdateFailed):
+    """HTTP error response from the Deye Cloud or API endpoint"""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class DeyeCloudAuthError(DeyeCloudHTTPError):
+    """Deye Cloud rejected the account credentials; retrying will not help"""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(401, message)
+
+
+class _AuthExpired(DeyeCloudHTTPError):
+    """Cached access token was rejected by Deye Cloud"""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(401, message)
+
+
 async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    session = aiohttp.ClientSession()
+    # Shared HA-managed session; it is owned by Home Assistant and must not be closed here
+    session = async_get_clientsession(hass)
 
     coordinator = DeyeCloudCoordinator(
         hass,
@@ -59,7 +98,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "coordinator": coordinator,
-        "session": session,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -68,9 +106,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    data = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
-    if data and data.get("session"):
-        await data["session"].close()
+    if unload_ok:
+        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
     return unload_ok
 
 
@@ -93,9 +130,28 @@ class DeyeCloudCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._server = config.get(CONF_SERVER, SERVER_EU)
         self._mode = config.get(CONF_MODE, MODE_DEYE_DIRECT)
         
+        # Static request parts for Deye Cloud Direct, built once per setup
+        base_url = f"https://{self._server}-developer.deyecloud.com/v1.0"
+        self._token_url = f"{base_url}/account/token"
+        self._data_url = f"{base_url}/device/latest"
+        self._json_headers = {"Content-Type": "application/json"}
+        if self._mode == MODE_DEYE_DIRECT:
+            self._token_params = {"appId": config[CONF_APP_ID]}
+            self._token_body = {
+                "appSecret": config[CONF_APP_SECRET],
+                "email": config[CONF_EMAIL],
+                "password": hashlib.sha256(config[CONF_PASSWORD].encode()).hexdigest(),
+            }
+            self._device_body = {"deviceList": [config[CONF_DEVICE_SN]]}
+        
         # Token caching
         self._access_token: str | None = None
-        self._token_expires_at: datetime | None = None
+        # Expiry on the event loop's monotonic clock, immune to wall-clock jumps
+        self._token_expires_at_mono: float = 0.0
+        self._token_lock = asyncio.Lock()
+        
+        # Digest of the last converted device payload
+        self._last_digest: bytes | None = None
         
         # Retry configuration
         self._max_retries = 3
@@ -103,19 +159,33 @@ class DeyeCloudCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def _async_update_data(self) -> dict[str, Any]:
         if self._mode == MODE_API:
-            return await self._update_from_api_with_retry()
-        return await self._update_from_deye_with_retry()
+            return await self._retry(self._update_from_api)
+        return await self._retry(self._update_from_deye)
 
-    async def _update_from_api_with_retry(self) -> dict[str, Any]:
-        last_exception = None
+    async def _retry(self, coro_factory: Callable[[], Awaitable[dict[str, Any]]]) -> dict[str, Any]:
+        """Run an update with exponential backoff and jitter between attempts"""
+        last_exception: Exception | None = None
+        
         for attempt in range(self._max_retries):
             try:
-                return await self._update_from_api()
-            except Exception as err:
+                _LOGGER.debug(f"Attempting to update data (attempt {attempt + 1}/{self._max_retries})")
+                return await coro_factory()
+            except (aiohttp.ClientError, asyncio.TimeoutError, UpdateFailed) as err:
+                # Client errors (bad credentials, bad request) will not succeed on retry
+                if isinstance(err, DeyeCloudHTTPError) and 400 <= err.status < 500 and err.status != 429:
+                    raise
                 last_exception = err
+                _LOGGER.warning(f"Update attempt {attempt + 1} failed: {err}")
+                
                 if attempt < self._max_retries - 1:
-                    await asyncio.sleep(self._retry_delay)
-        raise UpdateFailed(last_exception) from last_exception
+                    base = min(self._retry_delay * (2 ** attempt), MAX_RETRY_DELAY)
+                    delay = base * random.uniform(0.5, 1.5)
+                    _LOGGER.info(f"Retrying in {delay:.1f} seconds...")
+                    await asyncio.sleep(delay)
+                else:
+                    _LOGGER.error(f"All {self._max_retries} update attempts failed")
+        
+        raise UpdateFailed(f"Failed to update after {self._max_retries} attempts: {last_exception}") from last_exception
 
     async def _update_from_api(self) -> dict[str, Any]:
         """Fetch plain-text endpoint and parse as lines with tabs."""
@@ -123,91 +193,78 @@ class DeyeCloudCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         if self._config.get(CONF_TOKEN):
             headers["Authorization"] = f"Bearer {self._config[CONF_TOKEN]}"
         try:
-            async with self._session.get(self._config[CONF_URL], headers=headers, timeout=20) as resp:
+            async with self._session.get(self._config[CONF_URL], headers=headers, timeout=REQUEST_TIMEOUT) as resp:
                 text = await resp.text()
                 if resp.status >= 400:
-                    raise UpdateFailed(f"HTTP {resp.status}: {text[:200]}")
+                    raise DeyeCloudHTTPError(resp.status, f"HTTP {resp.status}: {text[:200]}")
         except aiohttp.ClientError as err:
             raise UpdateFailed(f"Network error during API fetch: {err}") from err
         return parse_deyecloud_text(text)
 
-    async def _update_from_deye_with_retry(self) -> dict[str, Any]:
-        """Update data with retry logic"""
-        last_exception = None
-        
-        for attempt in range(self._max_retries):
-            try:
-                _LOGGER.debug(f"Attempting to update data (attempt {attempt + 1}/{self._max_retries})")
-                return await self._update_from_deye()
-            except Exception as err:
-                last_exception = err
-                _LOGGER.warning(f"Update attempt {attempt + 1} failed: {err}")
-                
-                if attempt < self._max_retries - 1:
-                    _LOGGER.info(f"Retrying in {self._retry_delay} seconds...")
-                    await asyncio.sleep(self._retry_delay)
-                else:
-                    _LOGGER.error(f"All {self._max_retries} update attempts failed")
-        
-        raise UpdateFailed(f"Failed to update after {self._max_retries} attempts: {last_exception}") from last_exception
-
     async def _update_from_deye(self) -> dict[str, Any]:
         """Update data directly from Deye Cloud API"""
-        try:
-            # Get access token
+        # Use the cached token optimistically; re-authenticate once if it is rejected
+        for attempt in (1, 2):
             token = await self._get_deye_token()
-            
-            # Get device data
-            data = await self._get_deye_device_data(token)
-            
-            return data
-        except Exception as err:
-            raise UpdateFailed(err) from err
+            try:
+                return await self._get_deye_device_data(token)
+            except _AuthExpired:
+                _LOGGER.info("Access token rejected, requesting a new one")
+                self._access_token = None
+                self._token_expires_at_mono = 0.0
+                if attempt == 2:
+                    raise
 
     async def _get_deye_token(self) -> str:
         """Get access token from Deye Cloud API with caching"""
         # Check if we have a valid cached token
-        if (self._access_token and self._token_expires_at and 
-            datetime.now() < self._token_expires_at):
+        if self._token_valid():
             _LOGGER.debug("Using cached access token")
             return self._access_token
         
+        # Single-flight refresh: concurrent callers wait here and reuse the new token
+        async with self._token_lock:
+            if self._token_valid():
+                return self._access_token
+            return await self._fetch_deye_token()
+
+    def _token_valid(self) -> bool:
+        return bool(self._access_token) and asyncio.get_running_loop().time() < self._token_expires_at_mono
+
+    async def _fetch_deye_token(self) -> str:
+        """Request a new access token from Deye Cloud API"""
         _LOGGER.info("Requesting new access token from Deye Cloud API")
-        url = f"https://{self._server}-developer.deyecloud.com/v1.0/account/token"
-        
-        # Hash password
-        password_hash = hashlib.sha256(self._config[CONF_PASSWORD].encode()).hexdigest()
-        
-        # Build query parameters
-        params = {"appId": self._config[CONF_APP_ID]}
-        
-        # Request body
-        data = {
-            "appSecret": self._config[CONF_APP_SECRET],
-            "email": self._config[CONF_EMAIL],
-            "password": password_hash,
-        }
-        
-        headers = {
-            "Content-Type": "application/json",
-        }
-        
         try:
-            async with self._session.post(url, params=params, json=data, headers=headers, timeout=20) as resp:
+            async with self._session.post(
+                self._token_url,
+                params=self._token_params,
+                json=self._token_body,
+                headers=self._json_headers,
+                timeout=REQUEST_TIMEOUT,
+            ) as resp:
+                raw = await resp.read()
                 if resp.status != 200:
-                    text = await resp.text()
-                    raise UpdateFailed(f"Deye auth failed: HTTP {resp.status}: {text}")
+                    raise DeyeCloudHTTPError(
+                        resp.status, f"Deye auth failed: HTTP {resp.status}: {_preview(raw)}"
+                    )
                 
-                result = await resp.json()
+                result = _loads(raw)
                 if not result.get("success"):
-                    raise UpdateFailed(f"Deye auth failed: {result.get('msg', 'Unknown error')}")
+                    # Bad credentials come back as HTTP 200 with success=false
+                    raise DeyeCloudAuthError(f"Deye auth failed: {result.get('msg', 'Unknown error')}")
                 
                 if "accessToken" not in result:
                     raise UpdateFailed(f"No access token in response: {result}")
                 
-                # Cache the token (assume 1 hour expiry)
+                # Cache the token using the server-reported lifetime, refreshing a bit early
+                try:
+                    expires_in = int(result.get("expiresIn") or DEFAULT_TOKEN_TTL)
+                except (ValueError, TypeError):
+                    expires_in = DEFAULT_TOKEN_TTL
                 self._access_token = result["accessToken"]
-                self._token_expires_at = datetime.now() + timedelta(hours=1)
+                self._token_expires_at_mono = (
+                    asyncio.get_running_loop().time() + max(expires_in - TOKEN_REFRESH_MARGIN, 0)
+                )
                 
                 _LOGGER.info("Successfully obtained new access token")
                 return self._access_token
@@ -217,28 +274,36 @@ class DeyeCloudCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def _get_deye_device_data(self, token: str) -> dict[str, Any]:
         """Get device data from Deye Cloud API"""
-        url = f"https://{self._server}-developer.deyecloud.com/v1.0/device/latest"
-        
-        data = {
-            "deviceList": [self._config[CONF_DEVICE_SN]]
-        }
-        
-        headers = {
-            "Content-Type": "application/json",
-            "authorization": f"Bearer {token}",
-        }
+        headers = {**self._json_headers, "authorization": f"Bearer {token}"}
         
         try:
-            async with self._session.post(url, json=data, headers=headers, timeout=20) as resp:
+            async with self._session.post(
+                self._data_url, json=self._device_body, headers=headers, timeout=REQUEST_TIMEOUT
+            ) as resp:
+                raw = await resp.read()
+                if resp.status == 401:
+                    raise _AuthExpired(f"Deye data failed: HTTP {resp.status}: {_preview(raw)}")
                 if resp.status != 200:
-                    text = await resp.text()
-                    raise UpdateFailed(f"Deye data failed: HTTP {resp.status}: {text}")
+                    raise DeyeCloudHTTPError(
+                        resp.status, f"Deye data failed: HTTP {resp.status}: {_preview(raw)}"
+                    )
                 
-                result = await resp.json()
+                result = _loads(raw)
+                if result.get("success") is False and "token" in str(result.get("msg", "")).lower():
+                    raise _AuthExpired(f"Deye data failed: {result.get('msg')}")
                 _LOGGER.debug(f"Received device data: {len(result.get('deviceDataList', []))} devices")
                 
+                # Payload unchanged since last poll: reuse the converted data, refresh the timestamp
+                digest = hashlib.blake2b(
+                    orjson.dumps(result.get("deviceDataList")), digest_size=16
+                ).digest()
+                if digest == self._last_digest and self.data:
+                    return {**self.data, "last_update": _last_update_item()}
+                
                 # Convert Deye API response to our format
-                return self._convert_deye_response(result)
+                data = self._convert_deye_response(result)
+                self._last_digest = digest
+                return data
                 
         except aiohttp.ClientError as err:
             raise UpdateFailed(f"Network error during data fetch: {err}") from err
@@ -271,23 +336,9 @@ class DeyeCloudCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             # Normalize the key for Home Assistant
             normalized_key = normalize_key(key_name)
             
-            # Try to convert value to appropriate type
-            converted_value: Any
-            try:
-                if value is None or str(value).lower() in {"nan", "inf", "-inf", "null"}:
-                    converted_value = None
-                elif isinstance(value, (int, float)):
-                    converted_value = value
-                elif "." in str(value) or "e" in str(value).lower():
-                    converted_value = float(value)
-                else:
-                    converted_value = int(value)
-            except (ValueError, TypeError):
-                converted_value = str(value) if value is not None else None
-            
             data[normalized_key] = {
                 "name": key_name,
-                "value": converted_value,
+                "value": _coerce(value),
                 "unit": unit
             }
         
@@ -298,23 +349,53 @@ class DeyeCloudCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             "unit": None
         }
         
-        data["last_update"] = {
-            "name": "Last Update",
-            "value": datetime.now().isoformat(),
-            "unit": None
-        }
+        data["last_update"] = _last_update_item()
         
         _LOGGER.info(f"Successfully converted {len(data)} data items")
         return data
 
 
+def _loads(raw: bytes) -> dict[str, Any]:
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError as err:
+        raise UpdateFailed(f"Invalid JSON from Deye Cloud: {_preview(raw)}") from err
+
+
+def _preview(raw: bytes) -> str:
+    return raw[:200].decode("utf-8", "replace")
+
+
+def _last_update_item() -> dict[str, Any]:
+    return {"name": "Last Update", "value": datetime.now().isoformat(), "unit": None}
+
+
+_NORM_TABLE = str.maketrans({c: "_" for c in " /-()"})
+_MULTI_UNDERSCORE = re.compile(r"_+")
+
+
+@lru_cache(maxsize=512)
 def normalize_key(name: str) -> str:
-    key = name.strip().lower()
-    for ch in [" ", "/", "-", "(", ")"]:
-        key = key.replace(ch, "_")
-    while "__" in key:
-        key = key.replace("__", "_")
-    return key
+    return _MULTI_UNDERSCORE.sub("_", name.strip().lower().translate(_NORM_TABLE))
+
+
+_NULLISH = frozenset(("nan", "inf", "-inf", "null", "none", ""))
+
+
+def _coerce(value: Any) -> Any:
+    """Convert a raw value to int/float where possible, None for missing/non-finite"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return value if math.isfinite(value) else None
+    s = str(value)
+    sl = s.lower()
+    if sl in _NULLISH:
+        return None
+    try:
+        return float(s) if ("." in s or "e" in sl) else int(s)
+    except ValueError:
+        return s
 
 
 def parse_deyecloud_text(raw_text: str) -> dict[str, Any]:
@@ -330,20 +411,8 @@ def parse_deyecloud_text(raw_text: str) -> dict[str, Any]:
         value_str = parts[1].strip()
         unit = parts[2].strip() if len(parts) >= 3 else None
 
-        # Try numeric cast
-        value: Any
-        try:
-            if value_str.lower() in {"nan", "inf", "-inf"}:
-                value = None
-            elif "." in value_str or "e" in value_str.lower():
-                value = float(value_str)
-            else:
-                value = int(value_str)
-        except Exception:
-            value = value_str
-
         key = normalize_key(name)
-        data[key] = {"name": name, "value": value, "unit": unit}
+        data[key] = {"name": name, "value": _coerce(value_str), "unit": unit}
 
     return data
 
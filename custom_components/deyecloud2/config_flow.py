@@ -4,6 +4,7 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import aiohttp_client
 import aiohttp
 import hashlib
 
@@ -118,20 +119,24 @@ class DeyeCloudConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             "Content-Type": "application/json",
         }
         
+        # Reuse Home Assistant's shared session instead of opening a new pool per attempt
+        session = aiohttp_client.async_get_clientsession(self.hass)
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, params=params, json=data, headers=headers, timeout=10) as resp:
-                    if resp.status != 200:
-                        text = await resp.text()
-                        raise ValueError(f"Authentication failed: HTTP {resp.status}: {text}")
-                    
-                    result = await resp.json()
-                    if not result.get("success"):
-                        raise ValueError(f"Authentication failed: {result.get('msg', 'Unknown error')}")
+            async with session.post(
+                url, params=params, json=data, headers=headers, timeout=aiohttp.ClientTimeout(total=10)
+            ) as resp:
+                if resp.status != 200:
+                    text = await resp.text()
+                    raise ValueError(f"Authentication failed: HTTP {resp.status}: {text}")
+                
+                result = await resp.json()
+                if not result.get("success"):
+                    raise ValueError(f"Authentication failed: {result.get('msg', 'Unknown error')}")
+                
+                if "accessToken" not in result:
+                    raise ValueError("No access token received")
                     
-                    if "accessToken" not in result:
-                        raise ValueError("No access token received")
-                        
         except aiohttp.ClientError as err:
             raise ValueError(f"Network error: {err}") from err
 
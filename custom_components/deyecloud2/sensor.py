@@ -35,6 +35,53 @@ ICON_MAP = {
     "default": "mdi:chart-line"
 }
 
+# (device_class, state_class, icon) per sensor kind
+_Classification = tuple[SensorDeviceClass | None, SensorStateClass | None, str]
+
+_POWER: _Classification = (SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, ICON_MAP["power"])
+_VOLTAGE: _Classification = (SensorDeviceClass.VOLTAGE, SensorStateClass.MEASUREMENT, ICON_MAP["voltage"])
+_CURRENT: _Classification = (SensorDeviceClass.CURRENT, SensorStateClass.MEASUREMENT, ICON_MAP["current"])
+_FREQUENCY: _Classification = (SensorDeviceClass.FREQUENCY, SensorStateClass.MEASUREMENT, ICON_MAP["frequency"])
+_ENERGY: _Classification = (SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING, ICON_MAP["energy"])
+_BATTERY: _Classification = (SensorDeviceClass.BATTERY, SensorStateClass.MEASUREMENT, ICON_MAP["percentage"])
+_TEMPERATURE: _Classification = (None, SensorStateClass.MEASUREMENT, ICON_MAP["temperature"])
+_DEFAULT: _Classification = (None, SensorStateClass.MEASUREMENT, ICON_MAP["default"])
+
+# Keyed by lowercased unit
+_UNIT_CLASS: dict[str, _Classification] = {
+    "w": _POWER, "kw": _POWER, "mw": _POWER,
+    "v": _VOLTAGE, "kv": _VOLTAGE,
+    "a": _CURRENT, "ma": _CURRENT,
+    "hz": _FREQUENCY, "khz": _FREQUENCY,
+    "wh": _ENERGY, "kwh": _ENERGY, "mwh": _ENERGY,
+    "%": _BATTERY,
+    "°c": _TEMPERATURE, "°f": _TEMPERATURE, "c": _TEMPERATURE, "f": _TEMPERATURE,
+}
+
+# Checked in order against the lowercased name when the unit is unknown
+_NAME_TOKENS: tuple[tuple[str, _Classification], ...] = (
+    ("power", _POWER),
+    ("voltage", _VOLTAGE),
+    ("current", _CURRENT),
+    ("frequency", _FREQUENCY),
+    ("energy", _ENERGY),
+    ("production", _ENERGY),
+    ("temp", _TEMPERATURE),
+)
+
+_NAME_EXACT: dict[str, _Classification] = {"soc": _BATTERY, "bmssoc": _BATTERY}
+
+
+def classify(unit: str | None, name_lc: str) -> _Classification:
+    """Return (device_class, state_class, icon) for a sensor unit and lowercased name"""
+    result = _UNIT_CLASS.get((unit or "").strip().lower()) or _NAME_EXACT.get(name_lc)
+    if result:
+        return result
+    for token, result in _NAME_TOKENS:
+        if token in name_lc:
+            return result
+    return _DEFAULT
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -55,14 +102,16 @@ async def async_setup_entry(
     known_keys: set[str] = set(coordinator.data.keys())
 
     def _maybe_add_new_sensors() -> None:
-        new_entities: list[DeyeCloudSensor] = []
-        for key, payload in coordinator.data.items():
-            if key in known_keys:
-                continue
-            known_keys.add(key)
-            new_entities.append(DeyeCloudSensor(coordinator, key=key, name=payload.get("name", key)))
-        if new_entities:
-            async_add_entities(new_entities)
+        data = coordinator.data
+        if not data:
+            return
+        new_keys = data.keys() - known_keys
+        if not new_keys:
+            return
+        known_keys.update(new_keys)
+        async_add_entities(
+            [DeyeCloudSensor(coordinator, key=key, name=data[key].get("name", key)) for key in new_keys]
+        )
 
     coordinator.async_add_listener(_maybe_add_new_sensors)
 
@@ -73,11 +122,11 @@ class DeyeCloudSensor(CoordinatorEntity[DeyeCloudCoordinator], SensorEntity):
         self._key = key
         self._attr_name = f"Deye {name}"
         self._attr_unique_id = f"deyecloud2_{key}"
-        # Derive device_class/state_class from unit/name
-        self._attr_device_class, self._attr_state_class = self._derive_classes(name)
-        
-        # Set icon based on sensor type
-        self._attr_icon = self._derive_icon(name)
+        # Derive device_class/state_class/icon from unit/name
+        payload = coordinator.data.get(key) or {}
+        self._attr_device_class, self._attr_state_class, self._attr_icon = classify(
+            payload.get("unit"), name.lower()
+        )
         
         self._device_info = DeviceInfo(
             identifiers={(DOMAIN, "deyecloud2")},
@@ -102,75 +151,6 @@ class DeyeCloudSensor(CoordinatorEntity[DeyeCloudCoordinator], SensorEntity):
         unit = None if payload is None else payload.get("unit")
         return unit
 
-    def _derive_classes(self, name: str) -> tuple[SensorDeviceClass | None, SensorStateClass | None]:
-        payload = self.coordinator.data.get(self._key) or {}
-        unit = (payload.get("unit") or "").strip()
-        lname = name.lower()
-
-        # Power
-        if unit in {"W", "kW", "MW"} or "power" in lname:
-            return SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT
-
-        # Voltage
-        if unit in {"V", "kV"} or "voltage" in lname:
-            return SensorDeviceClass.VOLTAGE, SensorStateClass.MEASUREMENT
-
-        # Current
-        if unit in {"A", "mA"} or "current" in lname:
-            return SensorDeviceClass.CURRENT, SensorStateClass.MEASUREMENT
-
-        # Frequency
-        if unit in {"Hz", "kHz"} or "frequency" in lname:
-            return SensorDeviceClass.FREQUENCY, SensorStateClass.MEASUREMENT
-
-        # Energy
-        if unit in {"Wh", "kWh", "MWh"} or "energy" in lname or "production" in lname:
-            return SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING
-
-        # Percentage
-        if unit in {"%"} or lname in {"soc", "bmssoc"}:
-            return SensorDeviceClass.BATTERY, SensorStateClass.MEASUREMENT
-
-        return None, SensorStateClass.MEASUREMENT
-
-    def _derive_icon(self, name: str) -> str:
-        """Derive icon based on sensor name and type"""
-        lname = name.lower()
-        unit = ""
-        payload = self.coordinator.data.get(self._key) or {}
-        if payload:
-            unit = (payload.get("unit") or "").strip().lower()
-        
-        # Power sensors
-        if unit in {"w", "kw", "mw"} or "power" in lname:
-            return ICON_MAP["power"]
-        
-        # Voltage sensors
-        if unit in {"v", "kv"} or "voltage" in lname:
-            return ICON_MAP["voltage"]
-        
-        # Current sensors
-        if unit in {"a", "ma"} or "current" in lname:
-            return ICON_MAP["current"]
-        
-        # Frequency sensors
-        if unit in {"hz", "khz"} or "frequency" in lname:
-            return ICON_MAP["frequency"]
-        
-        # Energy sensors
-        if unit in {"wh", "kwh", "mwh"} or "energy" in lname or "production" in lname:
-            return ICON_MAP["energy"]
-        
-        # Percentage sensors
-        if unit == "%" or lname in {"soc", "bmssoc"}:
-            return ICON_MAP["percentage"]
-        
-        # Temperature sensors
-        if unit in {"°c", "°f", "c", "f"} or "temp" in lname or "temperature" in lname:
-            return ICON_MAP["temperature"]
-        
-        return ICON_MAP["default"]
-
     # No entity_category assignment; default behavior keeps all entities visible
 
 
@@ -0,0 +1,32 @@
+"""Fixtures for Deye Cloud 2 tests."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from custom_components.deyecloud2 import DeyeCloudCoordinator
+
+from .const import MOCK_API_CONFIG, MOCK_DEYE_CONFIG
+
+
+def _make_coordinator(hass, aioclient_mock, config) -> DeyeCloudCoordinator:
+    coordinator = DeyeCloudCoordinator(
+        hass,
+        aioclient_mock.create_session(hass.loop),
+        config,
+        update_interval=timedelta(seconds=60),
+    )
+    # No backoff sleeps in tests
+    coordinator._retry_delay = 0
+    return coordinator
+
+
+@pytest.fixture
+async def deye_coordinator(hass, aioclient_mock) -> DeyeCloudCoordinator:
+    return _make_coordinator(hass, aioclient_mock, MOCK_DEYE_CONFIG)
+
+
+@pytest.fixture
+async def api_coordinator(hass, aioclient_mock) -> DeyeCloudCoordinator:
+    return _make_coordinator(hass, aioclient_mock, MOCK_API_CONFIG)
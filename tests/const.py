@@ -0,0 +1,46 @@
+"""Constants for Deye Cloud 2 tests."""
+from custom_components.deyecloud2 import (
+    CONF_APP_ID,
+    CONF_APP_SECRET,
+    CONF_DEVICE_SN,
+    CONF_EMAIL,
+    CONF_MODE,
+    CONF_PASSWORD,
+    CONF_SERVER,
+    CONF_URL,
+    MODE_API,
+    MODE_DEYE_DIRECT,
+    SERVER_EU,
+)
+
+TOKEN_URL = "https://eu1-developer.deyecloud.com/v1.0/account/token"
+DATA_URL = "https://eu1-developer.deyecloud.com/v1.0/device/latest"
+API_URL = "http://deye.local/data"
+
+MOCK_DEYE_CONFIG = {
+    CONF_MODE: MODE_DEYE_DIRECT,
+    CONF_APP_ID: "app-id",
+    CONF_APP_SECRET: "app-secret",
+    CONF_EMAIL: "user@example.com",
+    CONF_PASSWORD: "password",
+    CONF_DEVICE_SN: "2401010001",
+    CONF_SERVER: SERVER_EU,
+}
+
+MOCK_API_CONFIG = {
+    CONF_MODE: MODE_API,
+    CONF_URL: API_URL,
+}
+
+MOCK_DEVICE_PAYLOAD = {
+    "success": True,
+    "deviceDataList": [
+        {
+            "deviceSn": "2401010001",
+            "dataList": [
+                {"key": "TotalSolarPower", "value": "1520.0", "unit": "W"},
+                {"key": "SOC", "value": "87", "unit": "%"},
+            ],
+        }
+    ],
+}
@@ -0,0 +1,110 @@
+"""Tests for the Deye Cloud 2 update coordinator."""
+from __future__ import annotations
+
+import copy
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMockResponse
+
+from custom_components.deyecloud2 import DeyeCloudAuthError, DeyeCloudHTTPError
+
+from .const import API_URL, DATA_URL, MOCK_DEVICE_PAYLOAD, TOKEN_URL
+
+
+@pytest.mark.parametrize("status", [HTTPStatus.BAD_REQUEST, HTTPStatus.FORBIDDEN])
+async def test_client_errors_not_retried(api_coordinator, aioclient_mock, status) -> None:
+    aioclient_mock.get(API_URL, status=status, text="rejected")
+
+    with pytest.raises(DeyeCloudHTTPError):
+        await api_coordinator._async_update_data()
+    assert aioclient_mock.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "status", [HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE]
+)
+async def test_transient_errors_retried(api_coordinator, aioclient_mock, status) -> None:
+    aioclient_mock.get(API_URL, status=status, text="try later")
+
+    with pytest.raises(UpdateFailed, match="after 3 attempts"):
+        await api_coordinator._async_update_data()
+    assert aioclient_mock.call_count == 3
+
+
+async def test_rejected_credentials_not_retried(deye_coordinator, aioclient_mock) -> None:
+    aioclient_mock.post(TOKEN_URL, json={"success": False, "msg": "auth invalid"})
+
+    with pytest.raises(DeyeCloudAuthError):
+        await deye_coordinator._async_update_data()
+    assert aioclient_mock.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "rejection",
+    [
+        {"status": HTTPStatus.UNAUTHORIZED, "text": "unauthorized"},
+        {"json": {"success": False, "msg": "token expired"}},
+    ],
+    ids=["http_401", "success_false"],
+)
+async def test_reauthenticates_when_token_rejected(
+    hass, deye_coordinator, aioclient_mock, rejection
+) -> None:
+    deye_coordinator._access_token = "stale"
+    deye_coordinator._token_expires_at_mono = hass.loop.time() + 3600
+    aioclient_mock.post(TOKEN_URL, json={"success": True, "accessToken": "fresh", "expiresIn": 3600})
+    responses = [
+        AiohttpClientMockResponse("post", DATA_URL, **rejection),
+        AiohttpClientMockResponse("post", DATA_URL, json=MOCK_DEVICE_PAYLOAD),
+    ]
+
+    async def _next_response(method, url, data):
+        return responses.pop(0)
+
+    aioclient_mock.post(DATA_URL, side_effect=_next_response)
+
+    data = await deye_coordinator._async_update_data()
+
+    assert data["totalsolarpower"]["value"] == 1520.0
+    assert [str(call[1]).split("?")[0] for call in aioclient_mock.mock_calls] == [
+        DATA_URL,
+        TOKEN_URL,
+        DATA_URL,
+    ]
+    assert aioclient_mock.mock_calls[-1][3]["authorization"] == "Bearer fresh"
+    assert deye_coordinator._access_token == "fresh"
+
+
+async def test_unchanged_payload_skips_conversion(deye_coordinator, aioclient_mock) -> None:
+    aioclient_mock.post(DATA_URL, json=MOCK_DEVICE_PAYLOAD)
+    first = await deye_coordinator._get_deye_device_data("token")
+    deye_coordinator.data = first
+
+    with patch.object(
+        deye_coordinator, "_convert_deye_response", wraps=deye_coordinator._convert_deye_response
+    ) as convert:
+        second = await deye_coordinator._get_deye_device_data("token")
+
+    convert.assert_not_called()
+    assert second is not first
+    assert {k: v for k, v in second.items() if k != "last_update"} == {
+        k: v for k, v in first.items() if k != "last_update"
+    }
+    assert second["last_update"]["name"] == "Last Update"
+
+
+async def test_changed_payload_is_converted(deye_coordinator, aioclient_mock) -> None:
+    aioclient_mock.post(DATA_URL, json=MOCK_DEVICE_PAYLOAD)
+    deye_coordinator.data = await deye_coordinator._get_deye_device_data("token")
+
+    changed = copy.deepcopy(MOCK_DEVICE_PAYLOAD)
+    changed["deviceDataList"][0]["dataList"][1]["value"] = "88"
+    aioclient_mock.clear_requests()
+    aioclient_mock.post(DATA_URL, json=changed)
+
+    data = await deye_coordinator._get_deye_device_data("token")
+
+    assert data["soc"]["value"] == 88
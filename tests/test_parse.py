@@ -0,0 +1,32 @@
+"""Tests for the plain-text API response parser."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.deyecloud2 import parse_deyecloud_text
+
+
+@pytest.mark.parametrize(
+    "raw_text",
+    [
+        "PV Power\t120\tW\rGrid Voltage\t230.5\tV\rSOC\t87\t%\r",
+        "PV Power\t120\tW\r\nGrid Voltage\t230.5\tV\r\nSOC\t87\t%\r\n",
+        "PV Power\t120\tW\rGrid Voltage\t230.5\tV\nSOC\t87\t%\r\n",
+    ],
+    ids=["cr", "crlf", "mixed"],
+)
+def test_parse_line_endings(raw_text: str) -> None:
+    data = parse_deyecloud_text(raw_text)
+
+    assert data == {
+        "pv_power": {"name": "PV Power", "value": 120, "unit": "W"},
+        "grid_voltage": {"name": "Grid Voltage", "value": 230.5, "unit": "V"},
+        "soc": {"name": "SOC", "value": 87, "unit": "%"},
+    }
+
+
+def test_parse_skips_blank_and_short_lines() -> None:
+    data = parse_deyecloud_text('\n  \nheader only\n Name "x"\t\tnan\t \n')
+
+    assert data == {'name_"x"': {"name": 'Name "x"', "value": None, "unit": None}}
+
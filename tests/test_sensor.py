@@ -0,0 +1,48 @@
+"""Tests for Deye Cloud 2 sensor classification."""
+from __future__ import annotations
+
+import pytest
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+
+from custom_components.deyecloud2.sensor import ICON_MAP, classify
+
+
+@pytest.mark.parametrize(
+    ("unit", "name", "device_class", "state_class", "icon"),
+    [
+        ("W", "totalsolarpower", SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, ICON_MAP["power"]),
+        ("kwh", "daily yield", SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING, ICON_MAP["energy"]),
+        (" V ", "grid l1", SensorDeviceClass.VOLTAGE, SensorStateClass.MEASUREMENT, ICON_MAP["voltage"]),
+        ("°C", "radiator", None, SensorStateClass.MEASUREMENT, ICON_MAP["temperature"]),
+    ],
+)
+def test_classify_by_unit(unit, name, device_class, state_class, icon) -> None:
+    assert classify(unit, name) == (device_class, state_class, icon)
+
+
+def test_classify_unit_takes_precedence_over_name() -> None:
+    # A known unit wins over a conflicting name token
+    assert classify("%", "battery power")[0] is SensorDeviceClass.BATTERY
+    assert classify("A", "grid voltage")[0] is SensorDeviceClass.CURRENT
+
+
+@pytest.mark.parametrize(
+    ("unit", "name", "device_class"),
+    [
+        (None, "battery power", SensorDeviceClass.POWER),
+        ("", "daily production", SensorDeviceClass.ENERGY),
+        ("unknown", "ac frequency", SensorDeviceClass.FREQUENCY),
+        (None, "soc", SensorDeviceClass.BATTERY),
+        (None, "bmssoc", SensorDeviceClass.BATTERY),
+    ],
+)
+def test_classify_falls_back_to_name(unit, name, device_class) -> None:
+    assert classify(unit, name)[0] is device_class
+
+
+def test_classify_default() -> None:
+    assert classify(None, "inverter status") == (
+        None,
+        SensorStateClass.MEASUREMENT,
+        ICON_MAP["default"],
+    )